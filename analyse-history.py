@@ -1,15 +1,23 @@
 import argparse
 import json
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timezone
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Callable, Iterator
 
 from ring_doorbell import Auth, Ring
 from ring_doorbell.exceptions import Requires2FAError, RingError
 
 import getpass
+import hashlib
 import os
 import pickle
+import re
 import shutil
+import sys
 import urllib.error
 import urllib.request
 
@@ -18,19 +26,70 @@ try:
 except ImportError:
     ZoneInfo = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Compressed bitmap of 64-bit ints; Ring event ids do not fit in 32 bits.
+    from pyroaring import BitMap64 as IdSet
+except ImportError:
+    IdSet = set
+
+try:
+    from ciso8601 import parse_datetime as parse_iso
+except ImportError:
+    if sys.version_info >= (3, 11):
+        parse_iso = datetime.fromisoformat
+    else:
+
+        def parse_iso(value: str) -> datetime:
+            # fromisoformat only accepts a trailing "Z" from Python 3.11.
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 TOKEN_CACHE = os.path.expanduser("~/.ring_token.cache")
 DEFAULT_HISTORY_LIMIT = 3000
 WINDOW_END_HOUR = 5
 WINDOW_END_MINUTE = 30
 DOWNLOAD_DIR = Path("ring_videos")
 HISTORY_PAGE_SIZE = 100  # number of events to request per API call
+DOWNLOAD_WORKERS = 8  # concurrent recording downloads across all doorbells
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # bytes copied per read when using the fallback URL
+AGGRESSIVE_SKIP_PAGES = 5  # pages without a match before --aggressive-skip stops
 LOCAL_TZ_NAME = "Europe/London"  # Use None to fall back to system timezone
 STATE_FILE = Path("ring_history_state.json")
+HITS_FILE = Path("ring_history_hits.jsonl")
+SECONDS_PER_DAY = 86400
+# \w matches exactly the characters str.isalnum() accepts, plus "_".
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def report(message: str) -> None:
+    """Print from worker threads with one write, so lines never run together."""
+    sys.stdout.write(message + "\n")
+
+
+def dumps_json(obj, pretty: bool = False) -> bytes:
+    """Serialise obj to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty else 0
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads_json(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def token_updater(token):
     with open(TOKEN_CACHE, "wb") as f:
-        pickle.dump(token, f)
+        f.write(dumps_json(token))
 
 
 def parse_args() -> argparse.Namespace:
@@ -53,12 +112,26 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Clear any stored resume checkpoint before running.",
     )
+    parser.add_argument(
+        "--aggressive-skip",
+        action="store_true",
+        help=(
+            "Stop paging a doorbell after "
+            f"{AGGRESSIVE_SKIP_PAGES} consecutive pages without a matching event."
+        ),
+    )
     parser.add_argument(
         "--state-file",
         type=Path,
         default=STATE_FILE,
         help=f"Path to save resume state (default: {STATE_FILE}).",
     )
+    parser.add_argument(
+        "--hits-file",
+        type=Path,
+        default=HITS_FILE,
+        help=f"Path to write this run's matching events (default: {HITS_FILE}).",
+    )
     parser.add_argument(
         "--download-dir",
         type=Path,
@@ -72,25 +145,47 @@ def load_state(path: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return loads_json(f.read())
     except (json.JSONDecodeError, OSError) as exc:
         print(f"Warning: unable to read state file {path}: {exc}")
         return {}
 
 
 def save_state(path: Path, state: dict) -> None:
+    """Write state atomically so an interrupted run never leaves a partial file."""
+    data = dumps_json(state, pretty=True)
+    tmp_path = path.with_name(path.name + ".tmp")
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, sort_keys=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
     except OSError as exc:
         print(f"Warning: unable to write state file {path}: {exc}")
 
 
+def load_hits(path: Path) -> list[dict]:
+    """Read back the matching events written during this run, sorted by time."""
+    try:
+        with open(path, "rb") as f:
+            hits = [loads_json(line) for line in f if line.strip()]
+    except (json.JSONDecodeError, OSError) as exc:
+        print(f"Warning: unable to read hits file {path}: {exc}")
+        return []
+    hits.sort(key=itemgetter("day", "time"))
+    return hits
+
+
 def load_auth():
     if os.path.exists(TOKEN_CACHE):
         with open(TOKEN_CACHE, "rb") as f:
-            token = pickle.load(f)
+            data = f.read()
+        if data[:1] == b"\x80":
+            # Caches written by older versions are pickles; migrate to JSON once.
+            token = pickle.loads(data)
+            token_updater(token)
+        else:
+            token = loads_json(data)
         return Auth("MyRingApp/1.0", token, token_updater)
     # first-time login
     username = input("Ring email: ")
@@ -113,78 +208,516 @@ class StaleCheckpointError(RuntimeError):
         self.message = message
 
 
+def datetime_epoch(value: datetime) -> float:
+    """Return epoch seconds for value, treating naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# created_at converters keyed by exact type; epoch seconds pass straight through.
+EPOCH_CONVERTERS: dict[type, Callable[..., float]] = {
+    int: float,
+    float: float,
+    datetime: datetime_epoch,
+    str: lambda value: datetime_epoch(parse_iso(value)),
+}
+
+
+def window_bounds(utc_day: int, local_tz) -> tuple[tuple[float, float, date], ...]:
+    """Return the filter windows overlapping a UTC day as epoch ranges.
+
+    Each entry is ``(start, end, local_day)`` with ``end`` exclusive. The
+    bounds are built from local wall-clock times, so daylight-saving shifts
+    are honoured; usually only one local day overlaps a given UTC day.
+    """
+    day_start = utc_day * SECONDS_PER_DAY
+    day_end = day_start + SECONDS_PER_DAY
+    window_end = time(WINDOW_END_HOUR, WINDOW_END_MINUTE)
+    bounds = []
+    for delta in (-1, 0, 1):
+        local_day = date.fromordinal(EPOCH_ORDINAL + utc_day + delta)
+        start = datetime.combine(local_day, time(), tzinfo=local_tz).timestamp()
+        # The window includes the whole of its final minute.
+        end = datetime.combine(local_day, window_end, tzinfo=local_tz).timestamp() + 60
+        if start < day_end and end > day_start:
+            bounds.append((start, end, local_day))
+    return tuple(bounds)
+
+
+def window_contains(ts_epoch: float, day_bounds: dict, local_tz) -> date | None:
+    """Return the local day whose window contains ts_epoch, or None.
+
+    day_bounds caches window_bounds() per UTC day number and is filled lazily.
+    """
+    utc_day = int(ts_epoch // SECONDS_PER_DAY)
+    bounds = day_bounds.get(utc_day)
+    if bounds is None:
+        bounds = day_bounds[utc_day] = window_bounds(utc_day, local_tz)
+    for start, end, local_day in bounds:
+        if start <= ts_epoch < end:
+            return local_day
+    return None
+
+
+def request_history_page(dev, page: int, limit: int, older_than: int | None) -> list:
+    """Request a single page of history, flagging stale checkpoints."""
+    kwargs = {"limit": limit}
+    if older_than is not None:
+        kwargs["older_than"] = older_than
+    try:
+        batch = list(dev.history(**kwargs))
+    except RingError as err:
+        error_text = str(err)
+        if "404" in error_text and older_than is not None:
+            report(
+                f"  • {dev.name}: received 404 for older_than={older_than}; "
+                "checkpoint may be stale. Aborting this fetch."
+            )
+            raise StaleCheckpointError(int(older_than), error_text) from err
+        raise
+    report(
+        f"  • {dev.name}: page {page}: requested {limit}, "
+        f"received {len(batch)} event(s)"
+    )
+    return batch
+
+
 def fetch_history(
     dev,
     total_limit: int,
     start_older_than: int | None = None,
-) -> list[dict]:
-    """Fetch up to total_limit history entries, paging as needed."""
-    events: list[dict] = []
+) -> Iterator[list[dict]]:
+    """Yield de-duplicated history pages until total_limit entries are seen.
+
+    Each page's older_than cursor is the last id of the previous page, so
+    pages cannot be requested out of order. Instead the next page is
+    requested on a background thread before the current one is yielded,
+    overlapping the round-trip with the caller's filtering and downloads.
+    """
+    collected = 0
     older_than: int | None = start_older_than
     page = 0
-    seen_ids: set[int] = set()
+    seen_ids = IdSet()
 
     if older_than is not None:
         try:
             older_than = int(older_than)
         except (TypeError, ValueError):
-            print(
+            report(
                 f"  • Ignoring invalid older_than checkpoint value: {older_than!r}"
             )
             older_than = None
 
-    while total_limit <= 0 or len(events) < total_limit:
-        remaining = total_limit - len(events) if total_limit > 0 else HISTORY_PAGE_SIZE
-        batch_limit = (
-            HISTORY_PAGE_SIZE if total_limit <= 0 else min(remaining, HISTORY_PAGE_SIZE)
-        )
-        kwargs = {"limit": max(batch_limit, 1)}
-        if older_than is not None:
-            kwargs["older_than"] = older_than
+    def batch_limit() -> int:
+        if total_limit <= 0:
+            return HISTORY_PAGE_SIZE
+        return max(min(total_limit - collected, HISTORY_PAGE_SIZE), 1)
 
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
         page += 1
-        try:
-            batch = list(dev.history(**kwargs))
-        except RingError as err:
-            error_text = str(err)
-            if "404" in error_text and older_than is not None:
-                print(
-                    f"  • Received 404 for older_than={older_than}; "
-                    "checkpoint may be stale. Aborting this fetch."
+        limit = batch_limit()
+        pending = prefetcher.submit(request_history_page, dev, page, limit, older_than)
+        while pending is not None:
+            batch = pending.result()
+            pending = None
+            if not batch:
+                break
+
+            events: list[dict] = []
+            for event in batch:
+                event_id = event.get("id")
+                if event_id is None:
+                    continue
+                try:
+                    event_id_int = int(event_id)
+                except (TypeError, ValueError):
+                    continue
+                if event_id_int in seen_ids:
+                    continue
+                seen_ids.add(event_id_int)
+                # Keep the parsed id so callers need not convert it again.
+                event["_id_int"] = event_id_int
+                events.append(event)
+                collected += 1
+                if 0 < total_limit <= collected:
+                    break
+
+            older_than = batch[-1].get("id")
+            if isinstance(older_than, str) and older_than.isdigit():
+                older_than = int(older_than)
+            if (
+                len(batch) >= limit
+                and older_than is not None
+                and (total_limit <= 0 or collected < total_limit)
+            ):
+                page += 1
+                limit = batch_limit()
+                pending = prefetcher.submit(
+                    request_history_page, dev, page, limit, older_than
                 )
-                raise StaleCheckpointError(int(older_than), error_text) from err
-            raise
-        print(
-            f"  • Page {page}: requested {kwargs['limit']}, received {len(batch)} event(s)"
+
+            if events:
+                yield events
+
+
+def file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def download_record(target_path: Path) -> dict:
+    """Describe a downloaded recording for the state file's download manifest."""
+    return {
+        "path": str(target_path),
+        "size": target_path.stat().st_size,
+        "sha256": file_sha256(target_path),
+    }
+
+
+def recording_size(dev, event_id) -> int | None:
+    """Return the server-side size of a recording, or None if it is unknown.
+
+    Share URLs are signed for GET, so a HEAD request would be rejected;
+    instead ask for the first byte and read the total from Content-Range.
+    """
+    try:
+        url = dev.recording_url(event_id)
+    except RingError as exc:
+        report(f"  • Unable to fetch recording URL for {event_id}: {exc}")
+        return None
+    if not url:
+        return None
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            content_range = response.headers.get("Content-Range")
+            content_length = response.headers.get("Content-Length")
+    except (urllib.error.URLError, OSError) as exc:
+        report(f"  • Unable to check recording size for {event_id}: {exc}")
+        return None
+    try:
+        if content_range:
+            return int(content_range.rpartition("/")[2])
+        return int(content_length)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_existing_download(
+    dev, event_id, target_path: Path, record: dict | None
+) -> tuple[bool, dict | None]:
+    """Decide whether an earlier download of event_id can be kept.
+
+    Returns (complete, record): complete is False when the recording should be
+    downloaded again, and record is the manifest entry to store for the file.
+    A file whose server-side size is unknown is recorded with size_verified
+    set to False rather than being checked again on every run.
+    """
+    if record is not None:
+        try:
+            if Path(record["path"]).stat().st_size == record.get("size"):
+                return True, record
+        except OSError:
+            pass
+    try:
+        local_size = target_path.stat().st_size
+    except OSError:
+        return False, None
+    # Only files not yet in the manifest get here, so the size check is a
+    # one-off: a verified file is recorded and skipped cheaply next time.
+    remote_size = recording_size(dev, event_id)
+    if remote_size is None:
+        if local_size == 0:
+            return False, None
+        return True, {**download_record(target_path), "size_verified": False}
+    if local_size != remote_size:
+        report(
+            f"  • Existing file is incomplete ({local_size} of {remote_size} bytes): "
+            f"{target_path}"
         )
+        # recording_download refuses to overwrite an existing file.
+        target_path.unlink(missing_ok=True)
+        return False, None
+    return True, download_record(target_path)
 
-        if not batch:
-            break
 
-        for event in batch:
-            event_id = event.get("id")
-            if event_id is None:
-                continue
+def download_recording(dev, event_id, target_path: Path) -> dict | None:
+    """Download one recording, falling back to the signed share URL.
+
+    Returns the manifest record for the saved file, or None on failure.
+    """
+    ring_error: RingError | None = None
+    saved = False
+    try:
+        saved = dev.recording_download(
+            event_id,
+            filename=str(target_path),
+        )
+    except RingError as exc:
+        ring_error = exc
+
+    if saved and target_path.exists():
+        report(f"  • Downloaded video to {target_path}")
+        return download_record(target_path)
+
+    if ring_error is not None:
+        report(f"  • Primary download failed for {event_id}: {ring_error}")
+    else:
+        report(f"  • Primary download saved nothing for {event_id}")
+
+    fallback_url = None
+    try:
+        fallback_url = dev.recording_url(event_id)
+    except RingError as url_exc:
+        report(f"  • Unable to fetch recording URL for {event_id}: {url_exc}")
+
+    if not fallback_url:
+        return None
+
+    try:
+        with urllib.request.urlopen(fallback_url) as response, open(
+            target_path, "wb"
+        ) as destination:
+            shutil.copyfileobj(response, destination, length=DOWNLOAD_CHUNK_SIZE)
+    except (urllib.error.URLError, OSError) as url_err:
+        report(f"  • Fallback download failed for {event_id}: {url_err}")
+        return None
+    report(f"  • Downloaded via fallback URL to {target_path}")
+    return download_record(target_path)
+
+
+def fetch_recording(
+    dev, event_id, target_path: Path, record: dict | None
+) -> tuple[bool, dict | None]:
+    """Download a recording unless a complete copy is already on disk.
+
+    Runs on the download pool, since checking an unrecorded file asks Ring for
+    its size. Returns (downloaded, record), where record is the manifest entry
+    to store, or None on failure or when the stored entry is still current.
+    """
+    complete, verified = check_existing_download(dev, event_id, target_path, record)
+    if complete:
+        existing = verified["path"] if verified else target_path
+        report(f"  • {dev.name}: Skipping download – already exists: {existing}")
+        return False, None if verified is record else verified
+    return True, download_recording(dev, event_id, target_path)
+
+
+def process_device(
+    dev,
+    resume_state: dict | None,
+    history_limit: int,
+    local_tz,
+    day_bounds: dict,
+    download_dir: Path,
+    download_pool: ThreadPoolExecutor,
+    record_hit: Callable[[dict], None],
+    download_manifest: dict,
+    skip_after_pages: int | None = None,
+) -> dict:
+    """Fetch, filter and download one doorbell's history.
+
+    resume_state is the stored checkpoint when resuming, otherwise None. Runs
+    on a worker thread, so results are returned for main() to merge rather
+    than written to shared state; matching events go to record_hit as they
+    are found. download_manifest is only read here. When skip_after_pages is
+    set, paging stops after that many consecutive pages without a match.
+    """
+    report(f"- {dev.name}: fetching history...")
+    # Per-event messages are buffered and written once per page instead of a
+    # write per line; this also stops concurrent devices interleaving output.
+    log_lines: list[str] = []
+    log = log_lines.append
+
+    def flush_log() -> None:
+        if log_lines:
+            report("\n".join(log_lines))
+            log_lines.clear()
+
+    result = {
+        "device_key": str(dev.device_api_id),
+        "total_events": 0,
+        "matching_events": 0,
+        "downloaded_files": [],
+        "downloads": {},
+        "skipped_downloads": 0,
+        "oldest_ts": None,
+        "checkpoint": None,
+        "stale_checkpoint": False,
+    }
+    resume_id = None
+    if resume_state is not None:
+        resume_raw = resume_state.get("older_than_id")
+        if resume_raw:
             try:
-                event_id_int = int(event_id)
+                resume_id = int(resume_raw)
             except (TypeError, ValueError):
-                continue
-            if event_id_int in seen_ids:
-                continue
-            seen_ids.add(event_id_int)
-            events.append(event)
-            if 0 < total_limit <= len(events):
-                break
+                log(
+                    f"  {dev.name}: invalid resume checkpoint {resume_raw!r}; "
+                    "ignoring and starting from latest events."
+                )
+                resume_id = None
+            else:
+                oldest_local = resume_state.get("oldest_timestamp_local")
+                if oldest_local:
+                    log(
+                        f"  {dev.name}: resuming from checkpoint older than id "
+                        f"{resume_raw} (oldest local timestamp: {oldest_local})"
+                    )
+                else:
+                    log(f"  {dev.name}: resuming from older_than id {resume_raw}")
+        else:
+            log(
+                f"  {dev.name}: no resume checkpoint found; starting from latest events."
+            )
 
-        older_than = batch[-1].get("id")
-        if isinstance(older_than, str) and older_than.isdigit():
-            older_than = int(older_than)
-        if len(batch) < kwargs["limit"]:
-            break
-        if older_than is None:
-            break
+    safe_device = UNSAFE_FILENAME_CHARS.sub("_", dev.name).strip("_")
+    device_oldest_ts: float | None = None
+    device_oldest_id: int | None = None
+    downloads: list[tuple[Future, object]] = []
+    # Events in the same second map to the same file; only the first is
+    # downloaded, as when an existing file is found on disk.
+    queued_paths: set[Path] = set()
+    pages_without_hit = 0
+    flush_log()
+    # The parse loop below runs for every event fetched, so bind the global
+    # lookups it repeats to locals once.
+    get_converter = EPOCH_CONVERTERS.get
+    in_window = window_contains
+    # Downloads start as soon as each page is filtered, while the next page
+    # is still being fetched.
+    try:
+        for history in fetch_history(dev, history_limit, start_older_than=resume_id):
+            result["total_events"] += len(history)
+            matches_before = result["matching_events"]
+            for ev in history:
+                created_at = ev.get("created_at")
+                converter = get_converter(type(created_at))
+                if converter is None:
+                    log(
+                        f"  • {dev.name}: Skipping event {ev.get('id')} – "
+                        f"unexpected timestamp type {type(created_at)}"
+                    )
+                    continue
+                try:
+                    ts_epoch = converter(created_at)
+                except ValueError:
+                    log(
+                        f"  • {dev.name}: Skipping event {ev.get('id')} – "
+                        f"unable to parse timestamp {created_at!r}"
+                    )
+                    continue
 
-    return events
+                event_id = ev.get("id")
+                event_id_int = ev.get("_id_int")
+                if event_id_int is not None and (
+                    device_oldest_ts is None or ts_epoch < device_oldest_ts
+                ):
+                    device_oldest_ts = ts_epoch
+                    device_oldest_id = event_id_int
+
+                local_day = in_window(ts_epoch, day_bounds, local_tz)
+                if local_day is not None:
+                    result["matching_events"] += 1
+                    ts_local = datetime.fromtimestamp(ts_epoch, local_tz)
+                    day = local_day.isoformat()
+                    time_label = ts_local.strftime("%H:%M:%S")
+                    entry = {
+                        "day": day,
+                        "device": dev.name,
+                        "kind": ev.get("kind"),
+                        "time": time_label,
+                        "id": event_id,
+                    }
+                    record_hit(entry)
+
+                    if event_id is None:
+                        log(f"  • {dev.name}: Skipping download – event has no id.")
+                        continue
+
+                    timestamp_label = f"{day}_{time_label.replace(':', '-')}"
+                    filename = f"{timestamp_label}"
+                    if safe_device:
+                        filename += f"_{safe_device}"
+                    filename += ".mp4"
+                    target_path = download_dir / filename
+
+                    if target_path in queued_paths:
+                        log(
+                            f"  • {dev.name}: Skipping download – already queued: "
+                            f"{target_path}"
+                        )
+                        result["skipped_downloads"] += 1
+                        continue
+
+                    queued_paths.add(target_path)
+                    downloads.append(
+                        (
+                            download_pool.submit(
+                                fetch_recording,
+                                dev,
+                                event_id,
+                                target_path,
+                                download_manifest.get(str(event_id)),
+                            ),
+                            event_id,
+                        )
+                    )
+            flush_log()
+            if result["matching_events"] > matches_before:
+                pages_without_hit = 0
+                continue
+            pages_without_hit += 1
+            if skip_after_pages is not None and pages_without_hit >= skip_after_pages:
+                report(
+                    f"  {dev.name}: no matching events in the last "
+                    f"{pages_without_hit} page(s); skipping older history."
+                )
+                break
+    except StaleCheckpointError as checkpoint_err:
+        log(
+            f"  !!! Stale checkpoint detected for {dev.name}. "
+            f"API returned 404 while using older_than={checkpoint_err.older_than}."
+        )
+        log(
+            "  Clearing stored checkpoint so the next run starts from the latest events."
+        )
+        result["stale_checkpoint"] = True
+    else:
+        log(f"  {dev.name}: collected {result['total_events']} event(s)")
+    finally:
+        flush_log()
+
+    for future, event_id in downloads:
+        downloaded, record = future.result()
+        if record is not None:
+            result["downloads"][str(event_id)] = record
+        if downloaded and record is not None:
+            result["downloaded_files"].append(Path(record["path"]))
+        else:
+            result["skipped_downloads"] += 1
+
+    result["oldest_ts"] = device_oldest_ts
+    if result["stale_checkpoint"]:
+        return result
+    if device_oldest_id is not None and device_oldest_ts is not None:
+        result["checkpoint"] = {
+            "older_than_id": str(device_oldest_id),
+            "oldest_timestamp_utc": datetime.fromtimestamp(
+                device_oldest_ts, timezone.utc
+            ).isoformat(),
+            "oldest_timestamp_local": datetime.fromtimestamp(
+                device_oldest_ts, local_tz
+            ).isoformat(),
+            "last_run_utc": datetime.now(timezone.utc).isoformat(),
+        }
+    return result
 
 
 def main() -> None:
@@ -193,14 +726,9 @@ def main() -> None:
     download_dir = args.download_dir
     state_path: Path = args.state_file
 
-    if args.reset_resume:
-        try:
-            state_path.unlink()
-        except FileNotFoundError:
-            pass
-
     state = load_state(state_path)
     doorbot_states: dict = state.setdefault("doorbots", {})
+    download_manifest: dict = state.setdefault("downloads", {})
 
     if args.reset_resume:
         doorbot_states.clear()
@@ -235,7 +763,6 @@ def main() -> None:
         "most recent events per doorbell."
     )
 
-    hits = {}
     total_events = 0
     matching_events = 0
     doorbots = ring.devices()["doorbots"]
@@ -243,192 +770,82 @@ def main() -> None:
     downloaded_files: list[Path] = []
     skipped_downloads = 0
     print(f"Located {len(doorbots)} doorbot(s).")
-    oldest_event_ts: datetime | None = None
+    oldest_event_ts: float | None = None
+    day_bounds: dict = {}
     state_dirty = False
-
-    for dev in doorbots:
-        print(f"- {dev.name}: fetching history...")
-        device_key = str(dev.device_api_id)
-        resume_id = None
-        if args.resume:
-            stored_resume = doorbot_states.get(device_key, {})
-            resume_raw = stored_resume.get("older_than_id")
-            if resume_raw:
-                try:
-                    resume_id = int(resume_raw)
-                except (TypeError, ValueError):
-                    print(
-                        f"  invalid resume checkpoint {resume_raw!r}; "
-                        "ignoring and starting from latest events."
-                    )
-                    resume_id = None
-                else:
-                    oldest_local = stored_resume.get("oldest_timestamp_local")
-                    if oldest_local:
-                        print(
-                            f"  resuming from checkpoint older than id {resume_raw} "
-                            f"(oldest local timestamp: {oldest_local})"
-                        )
-                    else:
-                        print(f"  resuming from older_than id {resume_raw}")
-            else:
-                print("  no resume checkpoint found; starting from latest events.")
-
-        try:
-            history = fetch_history(dev, history_limit, start_older_than=resume_id)
-        except StaleCheckpointError as checkpoint_err:
-            print(
-                f"  !!! Stale checkpoint detected for {dev.name}. "
-                f"API returned 404 while using older_than={checkpoint_err.older_than}."
-            )
-            print(
-                "  Clearing stored checkpoint so the next run starts from the latest events."
-            )
-            doorbot_states.pop(device_key, None)
-            state_dirty = True
-            continue
-        print(f"  collected {len(history)} event(s)")
-        if not history:
-            continue
-        device_oldest_ts: datetime | None = None
-        device_oldest_id: int | None = None
-        for ev in history:
-            total_events += 1
-            created_at = ev.get("created_at")
-            if isinstance(created_at, datetime):
-                raw_ts = created_at
-            elif isinstance(created_at, (int, float)):
-                raw_ts = datetime.fromtimestamp(created_at, tz=timezone.utc)
-            elif isinstance(created_at, str):
-                try:
-                    raw_ts = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                except ValueError:
-                    print(
-                        f"  • Skipping event {ev.get('id')} – unable to parse timestamp "
-                        f"{created_at!r}"
-                    )
-                    continue
-            else:
-                print(
-                    f"  • Skipping event {ev.get('id')} – unexpected timestamp type "
-                    f"{type(created_at)}"
-                )
+    state_saved = False
+    failed_devices: list[str] = []
+
+    hits_path: Path = args.hits_file
+    hits_lock = threading.Lock()
+
+    # Matching events are streamed to disk rather than held in memory, and
+    # read back sorted for the summary once all devices have finished.
+    def record_hit(entry: dict) -> None:
+        line = dumps_json(entry) + b"\n"
+        with hits_lock:
+            hits_file.write(line)
+
+    # Paging and downloads are dominated by network latency, so devices are
+    # processed concurrently and share one pool of download workers.
+    with open(hits_path, "wb") as hits_file, ThreadPoolExecutor(
+        max_workers=DOWNLOAD_WORKERS
+    ) as download_pool, ThreadPoolExecutor(
+        max_workers=max(len(doorbots), 1)
+    ) as device_pool:
+        futures = {
+            device_pool.submit(
+                process_device,
+                dev,
+                (
+                    doorbot_states.get(str(dev.device_api_id), {})
+                    if args.resume
+                    else None
+                ),
+                history_limit,
+                local_tz,
+                day_bounds,
+                download_dir,
+                download_pool,
+                record_hit,
+                download_manifest,
+                AGGRESSIVE_SKIP_PAGES if args.aggressive_skip else None,
+            ): dev
+            for dev in doorbots
+        }
+        # Checkpoint as each device finishes so a failure on one doorbell does
+        # not lose the progress already made on the others.
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                report(f"  {futures[future].name}: failed – {exc}")
+                failed_devices.append(futures[future].name)
                 continue
-
-            if raw_ts.tzinfo is None:
-                raw_ts = raw_ts.replace(tzinfo=timezone.utc)
-
-            if oldest_event_ts is None or raw_ts < oldest_event_ts:
-                oldest_event_ts = raw_ts
-
-            ts_utc = raw_ts.astimezone(timezone.utc)
-            ts_local = ts_utc.astimezone(local_tz)
-            hour = ts_local.hour
-            minute = ts_local.minute
-            event_id = ev.get("id")
-            event_id_int = None
-            if event_id is not None:
-                try:
-                    event_id_int = int(event_id)
-                except (TypeError, ValueError):
-                    event_id_int = None
-                else:
-                    if device_oldest_ts is None or raw_ts < device_oldest_ts:
-                        device_oldest_ts = raw_ts
-                        device_oldest_id = event_id_int
-
-            if (hour < WINDOW_END_HOUR) or (
-                hour == WINDOW_END_HOUR and minute <= WINDOW_END_MINUTE
+            total_events += result["total_events"]
+            matching_events += result["matching_events"]
+            downloaded_files.extend(result["downloaded_files"])
+            if result["downloads"]:
+                download_manifest.update(result["downloads"])
+                state_dirty = True
+            skipped_downloads += result["skipped_downloads"]
+            device_oldest_ts = result["oldest_ts"]
+            if device_oldest_ts is not None and (
+                oldest_event_ts is None or device_oldest_ts < oldest_event_ts
             ):
-                matching_events += 1
-                day = ts_local.strftime("%Y-%m-%d")
-                entry = {
-                    "device": dev.name,
-                    "kind": ev.get("kind"),
-                    "time": ts_local.strftime("%H:%M:%S"),
-                    "id": event_id,
-                }
-                hits.setdefault(day, []).append(entry)
-
-                if event_id is None:
-                    print("  • Skipping download – event has no id.")
-                    continue
-
-                timestamp_label = ts_local.strftime("%Y-%m-%d_%H-%M-%S")
-                safe_device = "".join(
-                    ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in dev.name
-                ).strip("_")
-                filename = f"{timestamp_label}"
-                if safe_device:
-                    filename += f"_{safe_device}"
-                filename += ".mp4"
-                target_path = download_dir / filename
-
-                if target_path.exists():
-                    print(f"  • Skipping download – already exists: {target_path}")
-                    skipped_downloads += 1
-                    continue
-
-                ring_error: RingError | None = None
-                try:
-                    dev.recording_download(
-                        event_id,
-                        filename=str(target_path),
-                    )
-                except RingError as exc:
-                    ring_error = exc
-
-                if ring_error is None and target_path.exists():
-                    print(f"  • Downloaded video to {target_path}")
-                    downloaded_files.append(target_path)
-                    continue
-
-                if ring_error is not None:
-                    print(
-                        f"  • Primary download failed for {event_id}: {ring_error}"
-                    )
-
-                fallback_url = None
-                try:
-                    fallback_url = dev.recording_url(event_id)
-                except RingError as url_exc:
-                    print(
-                        f"  • Unable to fetch recording URL for {event_id}: {url_exc}"
-                    )
-
-                if not fallback_url:
-                    skipped_downloads += 1
-                    continue
-
-                try:
-                    with urllib.request.urlopen(fallback_url) as response, open(
-                        target_path, "wb"
-                    ) as destination:
-                        shutil.copyfileobj(response, destination)
-                except (urllib.error.URLError, OSError) as url_err:
-                    print(
-                        f"  • Fallback download failed for {event_id}: {url_err}"
-                    )
-                    skipped_downloads += 1
-                else:
-                    print(f"  • Downloaded via fallback URL to {target_path}")
-                    downloaded_files.append(target_path)
-
-        if device_oldest_id is not None and device_oldest_ts is not None:
-            doorbot_states[device_key] = {
-                "older_than_id": str(device_oldest_id),
-                "oldest_timestamp_utc": device_oldest_ts.astimezone(
-                    timezone.utc
-                ).isoformat(),
-                "oldest_timestamp_local": device_oldest_ts.astimezone(
-                    local_tz
-                ).isoformat(),
-                "last_run_utc": datetime.now(timezone.utc).isoformat(),
-            }
-            state_dirty = True
-
-    if state_dirty:
-        save_state(state_path, state)
+                oldest_event_ts = device_oldest_ts
+            if result["stale_checkpoint"]:
+                doorbot_states.pop(result["device_key"], None)
+                state_dirty = True
+            elif result["checkpoint"] is not None:
+                doorbot_states[result["device_key"]] = result["checkpoint"]
+                state_dirty = True
+            if state_dirty:
+                save_state(state_path, state)
+                state_dirty = False
+                state_saved = True
+
+    if state_saved:
         print(f"Updated resume state saved to {state_path}")
 
     print(
@@ -436,16 +853,19 @@ def main() -> None:
         f"Matching events in window: {matching_events}."
     )
 
-    if oldest_event_ts:
+    if oldest_event_ts is not None:
         print(
             "Oldest event retrieved:",
-            oldest_event_ts.astimezone(local_tz).strftime("%Y-%m-%d %H:%M:%S %Z"),
+            datetime.fromtimestamp(oldest_event_ts, local_tz).strftime(
+                "%Y-%m-%d %H:%M:%S %Z"
+            ),
         )
 
+    hits = load_hits(hits_path)
     if hits:
-        for day in sorted(hits.keys()):
+        for day, rows in groupby(hits, key=itemgetter("day")):
             print(f"\n{day}")
-            for row in hits[day]:
+            for row in rows:
                 print(
                     f"  {row['time']}  {row['kind']:<8}  {row['device']}  (id={row['id']})"
                 )
@@ -456,13 +876,16 @@ def main() -> None:
 
     if downloaded_files:
         print("\nSaved recordings:")
-        for path in downloaded_files:
+        for path in sorted(downloaded_files):
             print(f"  {path}")
     elif matching_events:
         print(
             "\nNo recordings saved: device may lack subscription or files already existed."
         )
 
+    if failed_devices:
+        sys.exit(f"\nFailed to process: {', '.join(sorted(failed_devices))}")
+
 
 if __name__ == "__main__":
     main()